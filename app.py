@@ -1,7 +1,74 @@
 import streamlit as st
 import tempfile
+import hashlib
+import json
+import os
+from pathlib import Path
 import pandas as pd
-from main import PDFParser
+from main import Content, PDFParser
+
+# parsed results, keyed by SHA-256 of the uploaded PDF
+CACHE_DIR = Path(".cache")
+# bump whenever extraction output changes, so stale cached results are not served
+CACHE_VERSION = "v1"
+# in-memory Streamlit caches are bounded, older PDFs fall back to the on-disk cache
+MEMORY_CACHE_ENTRIES = 4
+MEMORY_CACHE_TTL = "1h"
+
+
+@st.cache_data(
+    show_spinner="Parsing PDF... this may take a while ⏳",
+    max_entries=MEMORY_CACHE_ENTRIES,
+    ttl=MEMORY_CACHE_TTL,
+)
+def load_content(digest: str, _pdf_buffer: memoryview) -> pd.DataFrame:
+    """
+    Parses an uploaded PDF into a DataFrame, one row per content item.
+    Cached by Streamlit on `digest` only, so reruns skip parsing and the buffer is never hashed.
+    """
+    cache_path = CACHE_DIR / f"{CACHE_VERSION}-{digest}.json"
+
+    if cache_path.exists():
+        # same PDF parsed before, skip parsing entirely
+        with open(cache_path, encoding="utf-8") as f:
+            extracted_data = Content.from_dict(json.load(f))
+    else:
+        # save to a temp file, writing the upload buffer directly instead of copying it to bytes
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+            tmp.write(_pdf_buffer)
+            tmp_path = tmp.name
+
+        parser = PDFParser(tmp_path)
+        extracted_data = parser.parse_pdf()
+
+        # written to a temp file then renamed, so readers never see a partial cache entry
+        CACHE_DIR.mkdir(exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=CACHE_DIR, suffix=".json.tmp", delete=False) as tmp:
+            tmp_cache_path = tmp.name
+        try:
+            parser.save_to_json(tmp_cache_path, extracted_data)
+            os.replace(tmp_cache_path, cache_path)
+        except Exception:
+            os.remove(tmp_cache_path)
+            raise
+
+    return pd.DataFrame({
+        "page": extracted_data.pages,
+        "type": extracted_data.types,
+        "section": extracted_data.sections,
+        "sub_section": extracted_data.sub_sections,
+        "text": extracted_data.texts,
+        "data": extracted_data.payloads,
+    }).sort_values("page", kind="stable")
+
+
+@st.cache_data(show_spinner=False, max_entries=MEMORY_CACHE_ENTRIES, ttl=MEMORY_CACHE_TTL)
+def to_csv(digest: str, _df: pd.DataFrame) -> bytes:
+    """
+    Encodes the parsed DataFrame as CSV once per PDF, rather than on every rerun.
+    """
+    return _df.to_csv(index=False).encode("utf-8")
+
 
 st.set_page_config(page_title="PDF Table Extractor", page_icon="📄")
 
@@ -10,31 +77,18 @@ st.title("📄 PDF Table Extractor")
 uploaded_file = st.file_uploader("Upload a PDF file", type=["pdf"])
 
 if uploaded_file is not None:
-    # save to a temp file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        tmp.write(uploaded_file.read())
-        tmp_path = tmp.name
-
-    st.info("Parsing PDF... this may take a while ⏳")
+    digest = hashlib.sha256(uploaded_file.getbuffer()).hexdigest()
 
     try:
-        parser = PDFParser(tmp_path)
-        extracted_data = parser.parse_pdf()  # assume returns list of tables or dict
-
-        # Convert to DataFrame for download (if not already)
-        if isinstance(extracted_data, pd.DataFrame):
-            df = extracted_data
-        else:
-            df = pd.DataFrame(extracted_data)
+        df = load_content(digest, uploaded_file.getbuffer())
 
         st.success("✅ Parsing complete!")
         st.dataframe(df)
 
         # Download button
-        csv_data = df.to_csv(index=False).encode("utf-8")
         st.download_button(
             label="📥 Download CSV",
-            data=csv_data,
+            data=to_csv(digest, df),
             file_name="parsed_output.csv",
             mime="text/csv",
         )
@@ -2,12 +2,226 @@ import json
 import re
 import sys
 import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import groupby
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
+import fitz
 import pdfplumber
+import numpy as np
 import pandas as pd
 from PIL import Image
-import camelot
+
+try:
+    import orjson
+except ImportError:
+    orjson=None
+
+#heading styles fused into one alternation, so each line is matched in a single call
+HEADING_RE=re.compile(
+    r'^(?:[A-Z][A-Z\s]+'  #all capitals
+    r'|\d+\.?\s+[A-Z].*'   #section numbers
+    r'|[A-Z][^.]*:'     #colon based enclosures
+    r'|\s*[A-Z][a-z]+\s+[A-Z].*'  #popular default title case 
+    r')$'
+)
+_SECTION_NUM_RE=re.compile(r'^\d+\.?\s+')
+
+def _is_break(line: str)->bool:
+    """
+    Determines if a stripped line breaks a paragraph, being either blank or a heading.
+
+    Args:
+        line: Stripped line of text.
+
+    Returns:
+        bool: Whether the line is blank or a heading.
+    """
+    return not line or HEADING_RE.match(line) is not None
+
+def _split_paragraphs(text: str)->List[Tuple[str, str]]:
+    """
+    Splits text into paragraphs and headings in a single pass over its lines.
+    Kept free of parser state, so it can be run on any page independently.
+
+    Args:
+        text: Content on a particular page.
+
+    Returns:
+        List: Kind, `paragraph` or `heading`, and text of each line group.
+    """
+    paragraphs=[]
+
+    lines=map(str.strip, text.splitlines()) #individual lines, stripped lazily
+
+    #runs of blank lines and headings break paragraphs, remaining runs are paragraphs
+    for is_break, group in groupby(lines, key=_is_break):
+        if not is_break:
+            paragraphs.append(("paragraph", ' '.join(group)))
+            continue
+
+        for line in group:
+            if line:
+                #sections are resolved after extraction, see `PDFParser._assign_sections`
+                paragraphs.append(("heading", line))
+
+    return paragraphs
+
+#camelot workers each load OpenCV and Ghostscript, so only a few are started
+MAX_CAMELOT_WORKERS=2
+
+def _available_cpus()->int:
+    """
+    Counts CPUs usable by this process, respecting affinity where the platform reports it.
+
+    Returns:
+        int: Number of usable CPUs.
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+#below this page count, process start-up outweighs the parallel speedup, so pages run serially
+MIN_PAGES_FOR_PROCESSES=4
+
+def _process_page_worker(pdf_path: str, page_num: int, text: str)->Dict[str, Any]:
+    """
+    Extracts raw content from a single page, for use in a worker pool.
+    Opens its own pdfplumber handle so no PDFMiner state is shared between workers.
+
+    Sections are left unassigned, and headings are kept as markers for
+    `PDFParser._assign_sections` to resolve in page order.
+
+    Args:
+        pdf_path: Path of the pdf being analyzed.
+        page_num: Page number of page to be processed.
+        text: Text of the page, as extracted by PyMuPDF in the parent process.
+
+    Returns:
+        Dict: Page number and raw page content.
+    """
+    #only the requested page is loaded, rather than building every page of the document
+    with pdfplumber.open(pdf_path, pages=[page_num]) as pdf:
+        return PDFParser._process_page(pdf.pages[0], page_num, text)
+
+def _camelot_chunk(pdf_path: str, pages: str)->List[Tuple[int, Optional[List[List[Any]]]]]:
+    """
+    Extracts tables from a chunk of pages with camelot, for use in a worker pool.
+    Returns plain lists, as camelot tables hold handles which cannot be pickled.
+
+    Args:
+        pdf_path: Path of the pdf being analyzed.
+        pages: Comma-separated page numbers to be processed.
+
+    Returns:
+        List: Page number and table data pairs, table data is None for empty tables.
+    """
+    #imported here, so documents not needing the fallback skip loading camelot and its dependencies
+    import camelot
+
+    tables=camelot.read_pdf(pdf_path, pages=pages)
+
+    results=[]
+    for table in tables:
+        df=table.df
+        cells=df.to_numpy(copy=False)
+        if cells.size==0:
+            results.append((table.page, None))
+        else:
+            results.append((table.page, [df.columns.tolist(), *cells.tolist()]))
+
+    return results
+
+#key holding the payload of each non-paragraph content type, when rebuilt as a dictionary
+PAYLOAD_KEYS={
+    "table": "table_data",
+    "chart": "image_info",
+}
+
+@dataclass
+class Content:
+    """
+    Extracted content stored column-wise, one entry per content item across all pages.
+    Dictionaries are only rebuilt when required, via `to_dict`.
+
+    Attributes:
+        n_pages: Number of pages in the document.
+        pages: Page number of each item.
+        types: Content type of each item, `paragraph`, `table` or `chart`.
+        sections: Section of each item.
+        sub_sections: Subsection of each item.
+        texts: Paragraph text, or description for tables and charts.
+        payloads: Table data or chart image info, None for paragraphs.
+    """
+    n_pages: int=0
+    pages: List[int]=field(default_factory=list)
+    types: List[str]=field(default_factory=list)
+    sections: List[Optional[str]]=field(default_factory=list)
+    sub_sections: List[Optional[str]]=field(default_factory=list)
+    texts: List[str]=field(default_factory=list)
+    payloads: List[Any]=field(default_factory=list)
+
+    def append(self, page_num: int, content_type: str, section: Optional[str], sub_section: Optional[str], text: str, payload: Any=None):
+        """
+        Appends a single content item.
+        """
+        self.pages.append(page_num)
+        self.types.append(content_type)
+        self.sections.append(section)
+        self.sub_sections.append(sub_section)
+        self.texts.append(text)
+        self.payloads.append(payload)
+
+    def to_dict(self)->Dict[str, Any]:
+        """
+        Rebuilds content as page dictionaries, keeping order of items within each page.
+
+        Returns:
+            Dict: Page and page data.
+        """
+        pages_data=[{"page_number": page_num, "content": []} for page_num in range(1, self.n_pages+1)]
+
+        for page_num, content_type, section, sub_section, text, payload in zip(
+            self.pages, self.types, self.sections, self.sub_sections, self.texts, self.payloads
+        ):
+            item={"type": content_type, "section": section, "sub_section": sub_section}
+            if content_type=="paragraph":
+                item["text"]=text
+            else:
+                item["description"]=text
+                item[PAYLOAD_KEYS[content_type]]=payload
+
+            pages_data[page_num-1]["content"].append(item)
+
+        return {"pages": pages_data}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any])->"Content":
+        """
+        Builds content from page dictionaries, as produced by `to_dict`.
+
+        Args:
+            data: Page and page data.
+
+        Returns:
+            Content: Extracted content of all pages.
+        """
+        content=cls(n_pages=len(data["pages"]))
+        for page in data["pages"]:
+            for item in page["content"]:
+                content_type=item["type"]
+                if content_type=="paragraph":
+                    text, payload=item["text"], None
+                else:
+                    text, payload=item["description"], item[PAYLOAD_KEYS[content_type]]
+
+                content.append(page["page_number"], content_type, item["section"], item["sub_section"], text, payload)
+
+        return content
 
 class PDFParser:
     """
@@ -24,80 +238,12 @@ class PDFParser:
         if not self.pdf_path.exists():
             raise FileNotFoundError(f"PDF File not found {pdf_path}")
         
-        self.pages_data=[]
+        self.content=Content()
         self.current_section=None
         self.current_sub_section=None
 
-    def _extract_paragraphs(self, text: str, page_num: int)->List[Dict[str, Any]]:
-        """
-        Extracts and structures parapgraphs as per provided text.
-        - individual line extraction.
-        - paragraph detection.
-        - heading detection.
-
-        Relies on helper function:
-        - `_detect_section`
-        - `_is_heading`
-        - `_update_sections`
-
-        Args:
-            text: Content on a particular page.
-            page_num: Page number of page being processed.
-        
-        Returns:
-            List: Dictionaries containing parapgraphs and relevant content.
-        """
-        paragraphs=[]
-
-        lines=text.split('\n') #individual lines
-        current_paragraph=[]
-
-        for line in lines:
-            line=line.strip()
-            if not line:
-                if current_paragraph:
-                    paragraph_text=' '.join(current_paragraph)
-                    if paragraph_text:
-                        section, sub_section=self._detect_section(paragraph_text)
-                        paragraphs.append({
-                            "type":"paragraph",
-                            "section": section,
-                            "sub_section": sub_section,
-                            "text": paragraph_text
-                        })
-                    current_paragraph=[]
-                continue
-            
-            if self._is_heading(line):
-                if current_paragraph:
-                    paragraph_text=" ".join(current_paragraph)
-                    if paragraph_text:
-                        section, sub_section=self._detect_section(paragraph_text)
-                        paragraphs.append({
-                            "type": "paragraph",
-                            "section": section,
-                            "text": paragraph_text
-                        })
-                    current_paragraph=[]
-
-                self._update_sections(line)
-            else:
-                current_paragraph.append(line)
-        
-        if current_paragraph:
-            paragraph_text=" ".join(current_paragraph)
-            if paragraph_text:
-                section, sub_section=self._detect_section(paragraph_text)
-                paragraphs.append({
-                    "type": "paragraph",
-                    "section": section,
-                    "sub_section": sub_section,
-                    "text": paragraph_text
-                })
-        
-        return paragraphs
-    
-    def _extract_tables_pdfplumber(self, page, page_num:int)->List[Dict[str, Any]]:
+    @staticmethod
+    def _extract_tables_pdfplumber(page, page_num:int)->List[Tuple[str, List[List[str]]]]:
         """
         Extracts tables using pdfplumber.
 
@@ -106,7 +252,7 @@ class PDFParser:
             page_num: page number of provided page.
         
         Returns:
-            list: dictionaries containing labelled tables and content
+            list: Description and data of labelled tables
         """
         tables=[]
 
@@ -121,54 +267,54 @@ class PDFParser:
                             cleaned_table.append(cleaned_row)
                     
                     if cleaned_table:
-                        tables.append({
-                            "type":"table",
-                            "section":self.current_section,
-                            "sub_section":self.current_sub_section,
-                            "description": f"table {i+1} from page {page_num}",
-                            "table_data": cleaned_table
-                        })
+                        tables.append((f"table {i+1} from page {page_num}", cleaned_table))
         
         except Exception as e:
             raise
         
         return tables
     
-    def _extract_tables_with_camelot(self):
+    def _extract_tables_with_camelot(self, pages: List[int]):
         """
         Utilises camelot as a fallback for extracting tables.
+        Pages are split into contiguous chunks processed in parallel, keeping table order.
+
+        Args:
+            pages: Page numbers to be processed.
         """
-        try:
-            tables=camelot.read_pdf(str(self.pdf_path), pages='all')
-
-            for i, table in enumerate(tables):
-                df=table.df
-                if not df.empty:
-                    table_data=[df.columns.tolist()]+df.values.tolist()
-
-                    page_num=table.page
-
-                    #appending while maintaining order of pages
-                    if page_num<=len(self.pages_data):
-                        existing_tables=[
-                            content for content in self.pages_data[page_num-1]["content"]
-                            if content["type"]=="table"
-                        ]
-
-                        #implies no existing table found
-                        if len(existing_tables)<=i:
-                            self.pages_data[page_num-1]["content"].append({
-                                "type":"table",
-                                "section":self.current_section,
-                                "sub_section":self.current_sub_section,
-                                "description": f"extracted table from page {page_num}",
-                                "table_data":table_data
-                            })
-        
-        except Exception as e:
-            raise
+        n_workers=min(_available_cpus(), MAX_CAMELOT_WORKERS)
+        chunks=[chunk for chunk in np.array_split(pages, n_workers) if chunk.size>0]
+
+        #processes, as ghostscript is not thread-safe
+        with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+            results=executor.map(
+                partial(_camelot_chunk, str(self.pdf_path)),
+                [','.join(map(str, chunk)) for chunk in chunks]
+            )
+            tables=[table for chunk_tables in results for table in chunk_tables]
+
+        self._merge_camelot_tables(tables)
+
+    def _merge_camelot_tables(self, tables: List[Tuple[int, Optional[List[List[Any]]]]]):
+        """
+        Merges tables found by camelot, as a fallback for pdfplumber.
+        Camelot only processes pages where pdfplumber found no table, so every non-empty table is kept.
+
+        Args:
+            tables: Page number and table data pairs, as returned by `_camelot_chunk`.
+        """
+        for page_num, table_data in tables:
+            if table_data is None:
+                continue
+
+            #order of pages is restored by `Content.to_dict`
+            self.content.append(
+                page_num, "table", self.current_section, self.current_sub_section,
+                f"extracted table from page {page_num}", table_data
+            )
     
-    def _detect_charts(self, page, page_num:int)->List[Dict[str, Any]]:
+    @staticmethod
+    def _detect_charts(page, page_num:int)->List[Tuple[str, Dict[str, Any]]]:
         """
         Detect, Extract and Return Chart information using basic chart properties, via detecting images.
 
@@ -177,55 +323,28 @@ class PDFParser:
             page_num: page number of provided page.
 
         Returns:
-            list: Dictionary containing chart metadata and content.
+            list: Description and image metadata of charts.
         """
         charts=[]
 
         try:
             if hasattr(page, 'images') and page.images:
                 for i, img in enumerate(page.images):
-                    if img.get('width', 0)>100 and img.get('height', 0)>100:
-                        charts.append({
-                            "type": "chart",
-                            "section": self.current_section,
-                            "sub_section": self.current_sub_section,
-                            "description": f"Chart/Image {i+1} detected on page {page_num}",
-                            "image_info":{
-                                "width": img.get("width"),
-                                "height": img.get('height'),
-                                "x0": img.get('x0'),
-                                "y0": img.get('y0')
-                            }
-                        })
+                    width=img.get('width', 0)
+                    height=img.get('height', 0)
+                    if width>100 and height>100:
+                        charts.append((f"Chart/Image {i+1} detected on page {page_num}", {
+                            "width": width,
+                            "height": height,
+                            "x0": img.get('x0'),
+                            "y0": img.get('y0')
+                        }))
         
         except Exception as e:
             raise
         
         return charts
     
-    def _is_heading(self, line: str)->bool:
-        """
-        Utilises regex to determine if a line is a heading.
-
-        Args:
-            line: Text to be classified as a heading
-        
-        Returns:
-            bool: Whether the line is a heading or not
-        """
-        heading_patterns = [
-            r'^[A-Z][A-Z\s]+$',  #all capitals
-            r'^\d+\.?\s+[A-Z]',   #section numbers
-            r'^[A-Z][^.]*:$',     #colon based enclosures
-            r'^\s*[A-Z][a-z]+\s+[A-Z]',  #popular default title case 
-        ]
-
-        for pattern in heading_patterns:
-            if re.match(pattern, line.strip()):
-                return True
-
-        return False
-
     def _update_sections(self, line:str):
         """
         Updates sections in the parent dictionary contained in `self`.
@@ -236,7 +355,7 @@ class PDFParser:
         line=line.strip()
 
         #regex-based heuristics to determine section or subsection
-        if re.match(r'^\d+\.?\s+', line):
+        if _SECTION_NUM_RE.match(line):
             self.current_section=line
             self.current_sub_section=None
         
@@ -247,13 +366,41 @@ class PDFParser:
         else:
             self.current_section=line
     
-    def _detect_section(self, text: str)->Tuple[Optional[str], Optional[str]]:
+    def _detect_section(self)->Tuple[Optional[str], Optional[str]]:
         """
         Retrieves stored section and subsection.
         """
         return self.current_section, self.current_sub_section
+
+    def _assign_sections(self, page_content: Dict[str, Any]):
+        """
+        Resolves sections for extracted page content, in document order, and stores it.
+        - headings update the current section and are dropped.
+        - paragraphs are labelled with the section current at their position.
+        - tables and charts are labelled with the section current at the end of the page text.
+
+        Must be called on pages sequentially, as sections carry across pages.
+
+        Args:
+            page_content: Raw page content from `_process_page`.
+        """
+        page_num=page_content["page_number"]
+        for kind, text in page_content["lines"]:
+            if kind=="heading":
+                self._update_sections(text)
+                continue
+
+            section, sub_section=self._detect_section()
+            self.content.append(page_num, "paragraph", section, sub_section, text)
+
+        section, sub_section=self._detect_section()
+        for description, table_data in page_content["tables"]:
+            self.content.append(page_num, "table", section, sub_section, description, table_data)
+
+        for description, image_info in page_content["charts"]:
+            self.content.append(page_num, "chart", section, sub_section, description, image_info)
     
-    def save_to_json(self, output_path: str, data: Dict[str, Any]):
+    def save_to_json(self, output_path: str, data: Content):
         """
         Saves extracted data as a json file.
 
@@ -263,61 +410,108 @@ class PDFParser:
         """
         try:
             output_file=Path(output_path)
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+
+            #orjson encodes in native code, stdlib json is only a fallback
+            if orjson is not None:
+                with open(output_file, 'wb') as f:
+                    f.write(orjson.dumps(data.to_dict(), option=orjson.OPT_INDENT_2))
+            else:
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    json.dump(data.to_dict(), f, indent=2, ensure_ascii=False)
             
         except Exception as e:
             raise
 
-    def _process_page(self, page, page_num: int)->Dict[str, Any]:
+    @staticmethod
+    def _process_page(page, page_num: int, text: str)->Dict[str, Any]:
         """
-        Helper function to extract content from a single page.
+        Helper function to extract raw content from a single page.
+        Only reads the page, so it is independent of other pages and of parser state,
+        and can run in worker processes without a parser instance.
 
         Relies on additional helper functions:
-        - `_extract_paragraphs`
+        - `_split_paragraphs`
         - `_extract_tables_pdfplumber`
         - `_detect_charts`
 
         To ensure complete information extraction.
+        Sections are assigned afterwards by `_assign_sections`.
+
+        Args:
+            page: pdfplumber page, for tables and charts.
+            page_num: Page number of page being processed.
+            text: Text of the page, as extracted by PyMuPDF.
         """
         page_content={
             "page_number":page_num,
-            "content":[]
+            "lines":[],
+            "tables":[],
+            "charts":[]
         }
 
         #text extraction
-        text=page.extract_text()
         if text:
-            paragraphs=self._extract_paragraphs(text, page_num)
-            page_content["content"].extend(paragraphs)
+            page_content["lines"]=_split_paragraphs(text)
         
         #table extraction
-        tables=self._extract_tables_pdfplumber(page, page_num)
-        page_content["content"].extend(tables)
+        page_content["tables"]=PDFParser._extract_tables_pdfplumber(page, page_num)
 
         #chart detection
-        charts=self._detect_charts(page, page_num)
-        page_content["content"].extend(charts)
+        page_content["charts"]=PDFParser._detect_charts(page, page_num)
 
         return page_content
     
-    def parse_pdf(self)->Dict[str, Any]:
+    def parse_pdf(self)->Content:
         """
         Function to extract content and return page data.
-        - Utilises pre-defined helper `_process_page` for primary content extraction.
-        - Utilises pre-defined helper `_extract_tables_with_camelot` for table extraction.
+        - Utilises `_process_page_worker` to extract pages, in parallel for longer documents.
+        - Utilises pre-defined helper `_assign_sections` to label content in page order.
+        - Utilises pre-defined helper `_extract_tables_with_camelot` for table extraction on pages where pdfplumber found none.
 
         Returns:
-            Dict: Page and page data.
+            Content: Extracted content of all pages.
         """
         try:
-            with pdfplumber.open(self.pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    page_content=self._process_page(page, page_num)
-                    self.pages_data.append(page_content)
-            
-            self._extract_tables_with_camelot()
-            return {"pages": self.pages_data}
+            #PyMuPDF for text, as pdfminer based extraction is far slower.
+            #read here with a single handle, as PyMuPDF must not be used from multiple threads
+            with fitz.open(self.pdf_path) as doc:
+                texts=[page.get_text("text", sort=True) for page in doc]
+            n_pages=len(texts)
+            self.content.n_pages=n_pages
+
+            if n_pages<MIN_PAGES_FOR_PROCESSES:
+                results=[
+                    _process_page_worker(str(self.pdf_path), page_num, text)
+                    for page_num, text in enumerate(texts, 1)
+                ]
+            else:
+                #processes bypass the GIL
+                max_workers=min(_available_cpus(), n_pages)
+
+                #batching pages per task cuts inter-process round trips
+                chunksize=max(1, n_pages//(4*max_workers))
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    results=list(executor.map(
+                        partial(_process_page_worker, str(self.pdf_path)),
+                        range(1, n_pages+1),
+                        texts,
+                        chunksize=chunksize
+                    ))
+
+            for page_content in results:
+                self._assign_sections(page_content)
+
+            #camelot is only a fallback, for pages where pdfplumber found no tables
+            table_pages={
+                page_num for page_num, content_type in zip(self.content.pages, self.content.types)
+                if content_type=="table"
+            }
+            missing_pages=[page_num for page_num in range(1, n_pages+1) if page_num not in table_pages]
+
+            if missing_pages:
+                self._extract_tables_with_camelot(missing_pages)
+
+            return self.content
 
         except Exception as e:
             raise